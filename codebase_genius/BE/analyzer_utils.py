@@ -10,12 +10,27 @@ Features:
 
 import os
 import json
-from typing import Dict, List, Optional, Set
+import functools
+import hashlib
+import mmap
+import shutil
+import subprocess
+from typing import Dict, List, Optional, Set, Tuple, Union
 from collections import defaultdict
-from graphviz import Digraph
-from tree_sitter import Parser, Language, Node
+from concurrent.futures import ProcessPoolExecutor
+from tree_sitter import Parser, Language, Query
 import tree_sitter_python as tspython
 
+try:
+    import orjson
+except ImportError:  # optional: fall back to stdlib json
+    orjson = None
+
+try:
+    from tree_sitter import QueryCursor
+except ImportError:  # tree-sitter < 0.25 runs captures on the Query itself
+    QueryCursor = None
+
 
 BUILTIN_FUNCTIONS = {
     'print', 'len', 'str', 'int', 'float', 'bool', 'dict', 'list', 'set', 'tuple', 'open', 'range', 'enumerate', 'zip', 'map', 'filter', 'sum',
@@ -29,227 +44,540 @@ JAC_KEYWORDS = {
     'visit', 'spawn', 'disengage', 'report', 'here', 'root', 'edge_in','edge_out', 'refs', 'filter_on', 'OPath', 'jid'
 }
 
+# Same exclusions as bytes, so call names can be filtered before decoding
+_EXCLUDED_CALLS = frozenset(name.encode('utf8') for name in BUILTIN_FUNCTIONS | JAC_KEYWORDS)
+
+# Directories never worth walking into
+SKIP_DIRS = frozenset({
+    '.git', '.hg', '__pycache__', 'venv', '.venv', 'node_modules', 'dist', 'build', '.tox', 'outputs'
+})
+
+# Source file extensions, as a tuple so one str.endswith() call checks both
+_SRC_EXT = ('.py', '.jac')
+
+
+PY_LANGUAGE = Language(tspython.language())
+
+# Definitions, base classes and call targets; matched in tree-sitter's C query engine
+ENTITY_QUERY = """
+(function_definition name: (identifier) @func.name) @func.def
+(class_definition name: (identifier) @class.name) @class.def
+(class_definition superclasses: (argument_list (identifier) @class.base))
+(call function: [(identifier) @call.name (attribute attribute: (identifier) @call.name)])
+"""
+
+# Compiled queries keyed by (language, query text). Grammars never change at
+# runtime, so entries are never invalidated.
+_QUERY_CACHE: Dict[Tuple[int, str], Query] = {}
+
 
 # ================================================================
 # PARSER INITIALIZATION
 # ================================================================
 
+@functools.lru_cache(maxsize=1)
 def init_parser() -> Optional[Parser]:
-    """Initialize Tree-sitter parser for Python."""
+    """Initialize Tree-sitter parser for Python (built once per process)."""
     try:
-        PY_LANGUAGE = Language(tspython.language())
-        parser = Parser(PY_LANGUAGE)
-        return parser
+        return Parser(PY_LANGUAGE)
     except Exception as e:
         print(f"❌ Failed to initialize parser: {e}")
         return None
 
 
+# Per-process parser used by analyze_one_file (set up by _init_worker_parser)
+_WORKER_PARSER: Optional[Parser] = None
+
+# Below this many files, process-pool startup costs more than it saves
+PARALLEL_MIN_FILES = 5
+
+# Files handed to a worker per round trip
+PARALLEL_CHUNKSIZE = 8
+
+
+def _init_worker_parser():
+    """ProcessPoolExecutor initializer: build one parser per worker process."""
+    global _WORKER_PARSER
+    _WORKER_PARSER = init_parser()
+
+
 # ================================================================
 # JAC CONVERSION
 # ================================================================
 
-def convert_jac_to_python(file_path: str) -> Optional[str]:
-    """Convert Jac file to Python."""
-    import tempfile
+@functools.lru_cache(maxsize=1)
+def _jac_executable() -> Optional[str]:
+    """Resolve the jac CLI once per process; None if it is not installed."""
+    jac = shutil.which("jac")
+    if jac is None:
+        print("⚠️  jac CLI not found; skipping .jac files")
+    return jac
 
-   # Create temp directory if it doesn't exist
-    temp_dir = os.path.join(tempfile.gettempdir(), "codebase_genius_temp")
-    os.makedirs(temp_dir, exist_ok=True)
-    
-    # Generate temp filename
-    filename = os.path.basename(file_path).replace(".jac", "_converted.py")
-    temp_path = os.path.join(temp_dir, filename)
+
+def convert_jac_to_python(file_path: str) -> Optional[bytes]:
+    """
+    Convert Jac file to Python; returns the generated source bytes.
+    Output is captured in memory, so no *_converted.py files are written.
+    """
+    jac = _jac_executable()
+    if jac is None:
+        return None
     
     try:
-        result = os.system(f"jac jac2py {file_path} > {temp_path} 2>/dev/null")
-        
-        if result == 0 and os.path.exists(temp_path) and os.path.getsize(temp_path) > 0:
-            return temp_path
-        else:
-            return None
-    except Exception as e:
+        result = subprocess.run([jac, "jac2py", file_path], capture_output=True, timeout=30)
+    except (OSError, subprocess.SubprocessError) as e:
         print(f"❌ Conversion error for {file_path}: {e}")
         return None
+    
+    if result.returncode == 0 and result.stdout:
+        return result.stdout
+    return None
 
 
 # ================================================================
-# ENTITY EXTRACTION 
+# QUERY CAPTURES
 # ================================================================
 
-def extract_entities_minimal(tree, source_code: bytes, file_path: str, original_path: str = None) -> Dict:
+def _get_query(language: Language, source: str) -> Query:
+    """Compile a query once per process and reuse it for every file."""
+    key = (id(language), source)
+    query = _QUERY_CACHE.get(key)
+    if query is None:
+        query = _QUERY_CACHE[key] = Query(language, source)
+    return query
+
+
+def _get_entity_query() -> Query:
+    """Compiled ENTITY_QUERY for Python sources."""
+    return _get_query(PY_LANGUAGE, ENTITY_QUERY)
+
+
+def _query_events(tree) -> List[Tuple]:
     """
-    Extract only essential information about functions and classes.
-    Returns compact structure focused on relationships.
+    Run the entity query over the tree and return its captures in document
+    order as plain (start_byte, -end_byte, capture_name) tuples. Outer nodes
+    sort before the nodes they contain, so callers can track nesting with a
+    stack of open byte ranges without touching Node objects again.
+    """
+    query = _get_entity_query()
+    if QueryCursor is None:
+        captures = query.captures(tree.root_node)
+    else:
+        captures = QueryCursor(query).captures(tree.root_node)
+    
+    events = []
+    for name, nodes in captures.items():
+        for node in nodes:
+            events.append((node.start_byte, -node.end_byte, name))
+    events.sort()
+    return events
+
+
+# ================================================================
+# ENTITY & RELATIONSHIP EXTRACTION
+# ================================================================
+
+def qualified_name(path: str, class_name: Optional[str], func_name: str) -> str:
+    """Call-graph key for a function: "<repo-relative path>::<class or empty>::<function>"."""
+    return f"{path}::{class_name or ''}::{func_name}"
+
+
+def extract_all(tree, source_code: bytes, file_path: str, original_path: str = None,
+                rel_path: str = None) -> Tuple[Dict, Dict[str, List[str]]]:
+    """
+    Extract functions/classes and function call relationships in one pass
+    over the query captures. Returns (entities, calls); calls is keyed by
+    qualified_name() so same-named functions in different scopes stay apart.
+    rel_path (the file's path within the repo) keeps same-named files such as
+    two util.py apart; without it, keys fall back to the file's basename.
     """
     functions = []
     classes = []
-    
-    def get_name(node: Node) -> str:
-        name_node = node.child_by_field_name('name')
-        return name_node.text.decode('utf8') if name_node else "unknown"
-    
-    def visit_node(node: Node, parent_class: str = None):
-        if node.type == 'function_definition':
-            func_name = get_name(node)
-            functions.append({
-                "name": func_name,
-                "parent": parent_class,
-                "line": node.start_point[0] + 1
-            })
-            return  # Don't recurse
-        
-        elif node.type == 'class_definition':
-            class_name = get_name(node)
-            
-            # Extract base classes
-            bases = []
-            superclasses = node.child_by_field_name('superclasses')
-            if superclasses:
-                for child in superclasses.children:
-                    if child.type == 'identifier':
-                        bases.append(child.text.decode('utf8'))
-            
-            classes.append({
-                "name": class_name,
-                "bases": bases,
-                "line": node.start_point[0] + 1
-            })
-            
-            # Visit methods
-            for child in node.children:
-                visit_node(child, class_name)
-            return
-        
-        # Recurse
-        for child in node.children:
-            visit_node(child, parent_class)
-    
-    visit_node(tree.root_node)
+    calls = defaultdict(set)
     
     # Use original path if provided (for .jac files), otherwise use actual path
     display_path = original_path if original_path else file_path
+    filename = os.path.basename(display_path)
+    key_path = rel_path or filename
     
-    return {
-        "file": os.path.basename(display_path),  # Use original filename
+    # Open definitions as [end_byte, inside_function, record, current_func, current_class].
+    # record is None for definitions nested inside a function (not reported);
+    # current_func is the qualified name of the innermost enclosing function,
+    # which calls belong to; current_class is the innermost enclosing class
+    stack = []
+    
+    # Line numbers come from counting newlines between consecutive definitions
+    line = 1
+    line_pos = 0
+    
+    for start, neg_end, capture in _query_events(tree):
+        end = -neg_end
+        while stack and stack[-1][0] <= start:
+            stack.pop()
+        top = stack[-1] if stack else None
+        inside_function = bool(top and top[1])
+        
+        if capture == 'func.def' or capture == 'class.def':
+            line += source_code[line_pos:start].count(b'\n')  # mmap has no count()
+            line_pos = start
+        
+        if capture == 'func.def':
+            record = None
+            if not inside_function:
+                parent = top[2]["name"] if top else None
+                record = {"name": "unknown", "parent": parent, "line": line}
+                functions.append(record)
+            stack.append([end, True, record, None, top[4] if top else None])
+        
+        elif capture == 'class.def':
+            record = None
+            if not inside_function:
+                record = {"name": "unknown", "bases": [], "line": line}
+                classes.append(record)
+            stack.append([end, inside_function, record, top[3] if top else None, None])
+        
+        elif capture == 'func.name' or capture == 'class.name':
+            name = source_code[start:end].decode('utf8')
+            if top[2] is not None:
+                top[2]["name"] = name
+            if capture == 'func.name':
+                top[3] = qualified_name(key_path, top[4], name)
+                calls[top[3]]  # Initialize
+            else:
+                top[4] = name
+        
+        elif capture == 'class.base':
+            if top[2] is not None:
+                top[2]["bases"].append(source_code[start:end].decode('utf8'))
+        
+        elif capture == 'call.name' and top and top[3]:
+            # Kept as bytes; decoded once per distinct name below
+            called = source_code[start:end]
+            
+            # ✅ Filter out built-ins and Jac keywords
+            if called not in _EXCLUDED_CALLS:
+                calls[top[3]].add(called)
+    
+    entities = {
+        "file": filename,  # Use original filename
+        "path": key_path,
         "functions": functions,
         "classes": classes
     }
+    # Sorted lists keep the output JSON-serializable and stable across runs
+    # (UTF-8 byte order matches code point order, so sort before decoding)
+    names = {}
+    for callees in calls.values():
+        for called in callees:
+            if called not in names:
+                names[called] = called.decode('utf8')
+    return entities, {func: [names[c] for c in sorted(callees)] for func, callees in calls.items()}
 
 
-# ================================================================
-# RELATIONSHIP EXTRACTION
-# ================================================================
+def extract_entities_minimal(tree, source_code: bytes, file_path: str, original_path: str = None) -> Dict:
+    """
+    Extract only essential information about functions and classes.
+    Returns compact structure focused on relationships.
+    """
+    return extract_all(tree, source_code, file_path, original_path)[0]
+
 
 def extract_call_relationships(tree, source_code: bytes) -> Dict[str, List[str]]:
     """ Extract function call relationships."""
-    calls = defaultdict(list)
+    return extract_all(tree, source_code, "")[1]
+
+
+# ================================================================
+# PER-FILE ANALYSIS
+# ================================================================
+
+# Files up to this size are read with a single os.read() call; larger ones
+# are memory-mapped so they are paged in on demand instead of copied
+SMALL_FILE_BYTES = 1024 * 1024
+
+_READ_FLAGS = os.O_RDONLY | getattr(os, 'O_BINARY', 0) | getattr(os, 'O_CLOEXEC', 0)
+
+
+def _read_source(file_path: str) -> Union[bytes, mmap.mmap]:
+    """
+    Read a source file, skipping the io stack for the common small-file case.
+    Large files come back as a read-only mmap, which the parser, hashing and
+    extract_all all accept like bytes; it is unmapped once the last reference
+    is dropped.
+    """
+    fd = os.open(file_path, _READ_FLAGS)
+    try:
+        size = os.fstat(fd).st_size
+        if size <= SMALL_FILE_BYTES:
+            return os.read(fd, size)
+        try:
+            return mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            pass  # Not mappable (special or shrinking file); read it instead
+    finally:
+        os.close(fd)
     
-    def visit_node(node: Node, current_func: str = None):
-        if node.type == 'function_definition':
-            name_node = node.child_by_field_name('name')
-            func_name = name_node.text.decode('utf8') if name_node else None
-            
-            if func_name:
-                calls[func_name]  # Initialize
-                for child in node.children:
-                    visit_node(child, func_name)
-            return
-        
-        elif node.type == 'call' and current_func:
-            func_node = node.child_by_field_name('function')
-            if func_node:
-                called = None
-                if func_node.type == 'identifier':
-                    called = func_node.text.decode('utf8')
-                elif func_node.type == 'attribute':
-                    attr = func_node.child_by_field_name('attribute')
-                    if attr:
-                        called = attr.text.decode('utf8')
-                        
-                # ✅ Filter out built-ins and Jac keywords
-                if called and called not in BUILTIN_FUNCTIONS and called not in JAC_KEYWORDS:
-                    if called not in calls[current_func]:
-                        calls[current_func].append(called)
-        
-        for child in node.children:
-            visit_node(child, current_func)
+    with open(file_path, 'rb') as f:
+        return f.read()
+
+
+def _analyze_source(file_path: str, raw: bytes, rel_path: str = None) -> Optional[Tuple[Dict, Dict[str, List[str]]]]:
+    """Parse already-read file contents (Jac files are converted first)."""
+    if _WORKER_PARSER is None:
+        _init_worker_parser()
+    if _WORKER_PARSER is None:
+        raise RuntimeError("Parser initialization failed")
+    
+    if file_path.endswith('.jac'):
+        source_code = convert_jac_to_python(file_path)
+        if not source_code:
+            return None
+    else:
+        source_code = raw
+    
+    tree = _WORKER_PARSER.parse(source_code)
+    
+    return extract_all(tree, source_code, file_path, rel_path=rel_path)
+
+
+def analyze_one_file(file_path: str, rel_path: str = None) -> Optional[Tuple[Dict, Dict[str, List[str]]]]:
+    """
+    Parse a single file and extract its entities and call relationships.
+    Jac files are converted to Python first; returns None if that fails.
+    Runs inside worker processes, so the parser lives in a module global
+    instead of being passed (and pickled) with every task.
+    """
+    return _analyze_source(file_path, _read_source(file_path), rel_path)
+
+
+def _content_digest(raw: bytes) -> str:
+    """Content hash used to recognise files that were touched but not edited."""
+    return hashlib.blake2b(raw, digest_size=16).hexdigest()
+
+
+def _analyze_changed_file(file_path: str, rel_path: str, known_digest: Optional[str]) -> Tuple[str, Optional[Tuple]]:
+    """
+    Worker task for a file whose mtime/size no longer match its cache entry.
+    Returns (digest, None) if the content still hashes to known_digest,
+    otherwise (digest, analyze_one_file-style result).
+    """
+    raw = _read_source(file_path)
+    digest = _content_digest(raw)
+    if digest == known_digest:
+        return digest, None
+    return digest, _analyze_source(file_path, raw, rel_path)
+
+
+def _analyze_task(task: Tuple[str, str, Optional[str]]) -> Tuple[Optional[Tuple], Optional[str]]:
+    """
+    pool.map-friendly wrapper around _analyze_changed_file: returns
+    (outcome, None), or (None, error message) so one bad file doesn't
+    abort the whole map.
+    """
+    try:
+        return _analyze_changed_file(*task), None
+    except Exception as e:
+        return None, str(e)
+
+
+# ================================================================
+# JSON I/O
+# ================================================================
+
+def _dumps_json(obj, indent: bool = False) -> bytes:
+    """Serialize to UTF-8 JSON, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(obj, indent=2 if indent else None).encode("utf-8")
+
+
+def _loads_json(data: bytes):
+    """Parse UTF-8 JSON, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+# ================================================================
+# PER-FILE PARSE CACHE
+# ================================================================
+
+# Bump when the shape of cached entries changes
+PARSE_CACHE_VERSION = 4
+
+
+def _parse_cache_file(cache_dir: str, file_path: str) -> str:
+    """Cache entry location for a source file (keyed by its absolute path)."""
+    key = hashlib.sha1(os.path.abspath(file_path).encode('utf-8')).hexdigest()
+    return os.path.join(cache_dir, f"{key}.json")
+
+
+def _load_parse_cache(cache_dir: str, file_path: str) -> Optional[Dict]:
+    """Return the file's cache entry ({version, mtime, size, hash, entities, calls}), if any."""
+    try:
+        with open(_parse_cache_file(cache_dir, file_path), "rb") as f:
+            entry = _loads_json(f.read())
+    except (OSError, ValueError):
+        return None
     
-    visit_node(tree.root_node)
-    return dict(calls)
+    if entry.get("version") != PARSE_CACHE_VERSION:
+        return None
+    return entry
+
+
+def _save_parse_cache(cache_dir: str, file_path: str, st: os.stat_result, digest: str,
+                      entities: Dict, calls: Dict):
+    """Write a cache entry atomically (temp file + os.replace)."""
+    entry_path = _parse_cache_file(cache_dir, file_path)
+    tmp_path = f"{entry_path}.{os.getpid()}.tmp"
+    entry = {
+        "version": PARSE_CACHE_VERSION,
+        "mtime": st.st_mtime_ns,
+        "size": st.st_size,
+        "hash": digest,
+        "entities": entities,
+        "calls": calls
+    }
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(_dumps_json(entry))
+        os.replace(tmp_path, entry_path)
+    except OSError as e:
+        print(f"  ⚠️ Could not cache {os.path.basename(file_path)}: {e}")
 
 
 # ================================================================
 # HIERARCHICAL TREE VISUALIZATION
 # ================================================================
 
-def build_dependency_tree(file_data: List[Dict], call_graph: Dict, output_path: str):
+# Above this many nodes dot's hierarchical layout becomes the slowest step of
+# the run; switch those graphs to the multilevel force-directed sfdp layout
+SFDP_MIN_NODES = 300
+
+
+def _max_graph_nodes() -> float:
+    """Node cap from CODEGENIUS_MAX_GRAPH_NODES (unset, 0 or invalid: no cap)."""
+    try:
+        limit = int(os.environ.get("CODEGENIUS_MAX_GRAPH_NODES", "0"))
+    except ValueError:
+        limit = 0
+    return limit if limit > 0 else float("inf")
+
+
+def _finish_graph(lines: List[str], node_count: int, truncated: bool, label: str) -> str:
+    """Pick the layout engine for the graph's size and close the DOT source."""
+    if node_count > SFDP_MIN_NODES:
+        # The layout attribute overrides the engine, so render_graphs can
+        # run the plain `dot` binary for every graph
+        lines.insert(3, '\tlayout=sfdp overlap=prism')
+    if truncated:
+        print(f"⚠️  {label} truncated to {node_count} nodes (CODEGENIUS_MAX_GRAPH_NODES)")
+    lines.append('}')
+    return '\n'.join(lines) + '\n'
+
+
+def _q(text: str) -> str:
+    """Quote a DOT identifier or label (backslashes first, then quotes)."""
+    return '"' + text.replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+
+def _dependency_tree_graph(file_data: List[Dict], call_graph: Dict) -> str:
     """
-    Builds a hierarchical dependency tree showing:
+    Builds a hierarchical dependency tree (as DOT source) showing:
     - Classes within files
     - Functions/methods within classes
     - Call relationships between functions
     """
-    dot = Digraph(comment="Code Dependency Tree", format='png')
-    dot.attr(rankdir='TB', size='14,10', dpi='250')
-    dot.attr('node', fontname='Arial', fontsize='10')
+    lines = [
+        '// Code Dependency Tree',
+        'digraph {',
+        '\tdpi=250 rankdir=TB size="14,10"',
+        '\tnode [fontname=Arial fontsize=10]'
+    ]
+    add = lines.append
+    limit = _max_graph_nodes()
+    node_count = 0
+    truncated = False
     
-    # Track all nodes for relationship drawing
+    # Track all nodes for relationship drawing: callers are looked up by
+    # qualified name, callees (recorded by bare name) by function name
+    qualified_functions = {}
     all_functions = {}
     
     # Create file clusters
     for file_info in file_data:
-        filename = file_info["file"]
+        if node_count >= limit:
+            truncated = True
+            break
+        # Repo-relative path (older results only have the basename) keeps
+        # same-named files in separate clusters
+        path = file_info.get("path", file_info["file"])
         
-        with dot.subgraph(name=f'cluster_{filename}') as cluster:
-            cluster.attr(label=filename, style='rounded', color='blue')
-            
-            # Add classes
-            for cls in file_info.get("classes", []):
-                class_node = f"{filename}_{cls['name']}"
-                cluster.node(class_node, cls['name'], 
-                           shape='box', style='filled', fillcolor='lightblue')
-                
-                # Add methods under class
-                for func in file_info.get("functions", []):
-                    if func.get("parent") == cls['name']:
-                        func_node = f"{filename}_{func['name']}"
-                        cluster.node(func_node, func['name'], 
-                                   shape='ellipse', style='filled', fillcolor='lightgreen')
-                        cluster.edge(class_node, func_node, style='dotted')
-                        all_functions[func['name']] = func_node
+        # Group functions by owning class once instead of rescanning per class
+        by_parent = defaultdict(list)
+        standalone = []
+        for func in file_info.get("functions", []):
+            if func.get("parent"):
+                by_parent[func["parent"]].append(func)
+            else:
+                standalone.append(func)
+        
+        add(f'\tsubgraph {_q("cluster_" + path)} {{')
+        add(f'\t\tcolor=blue label={_q(path)} style=rounded')
+        
+        # Add classes
+        for cls in file_info.get("classes", []):
+            if node_count >= limit:
+                truncated = True
+                break
+            class_node = _q(f"{path}_{cls['name']}")
+            add(f'\t\t{class_node} [label={_q(cls["name"])} fillcolor=lightblue shape=box style=filled]')
+            node_count += 1
             
-            # Add standalone functions
-            for func in file_info.get("functions", []):
-                if not func.get("parent"):
-                    func_node = f"{filename}_{func['name']}"
-                    cluster.node(func_node, func['name'], 
-                               shape='ellipse', style='filled', fillcolor='lightyellow')
-                    all_functions[func['name']] = func_node
+            # Add methods under class
+            for func in by_parent.get(cls['name'], ()):
+                if node_count >= limit:
+                    truncated = True
+                    break
+                node_count += 1
+                func_node = _q(f"{path}_{func['name']}")
+                add(f'\t\t{func_node} [label={_q(func["name"])} fillcolor=lightgreen shape=ellipse style=filled]')
+                add(f'\t\t{class_node} -> {func_node} [style=dotted]')
+                qualified_functions[qualified_name(path, cls['name'], func['name'])] = func_node
+                all_functions[func['name']] = func_node
+        
+        # Add standalone functions
+        for func in standalone:
+            if node_count >= limit:
+                truncated = True
+                break
+            node_count += 1
+            func_node = _q(f"{path}_{func['name']}")
+            add(f'\t\t{func_node} [label={_q(func["name"])} fillcolor=lightyellow shape=ellipse style=filled]')
+            qualified_functions[qualified_name(path, None, func['name'])] = func_node
+            all_functions[func['name']] = func_node
+        
+        add('\t}')
     
     # Add call relationships (only between defined functions)
     for caller, callees in call_graph.items():
-        if caller in all_functions:
+        if caller in qualified_functions:
             for callee in callees:
                 if callee in all_functions:
-                    dot.edge(all_functions[caller], all_functions[callee], 
-                           color='gray', arrowsize='0.7')
+                    add(f'\t{qualified_functions[caller]} -> {all_functions[callee]} [arrowsize=0.7 color=gray]')
     
-    # Render
-    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
-    try:
-        dot.render(output_path, cleanup=True)
-        print(f"✅ Dependency tree rendered: {output_path}.png")
-    except Exception as e:
-        print(f"❌ Failed to render graph: {e}")
-
-
-def build_class_hierarchy(file_data: List[Dict], output_path: str):
-
-    dot = Digraph(comment="Class Hierarchy", format='png')
-    dot.attr(rankdir='BT', size='10,8', dpi='250')
-    dot.attr('node', shape='box', style='rounded,filled', 
-             fillcolor='lightblue', fontname='Arial')
+    return _finish_graph(lines, node_count, truncated, "Dependency tree")
+
+
+def _class_hierarchy_graph(file_data: List[Dict]) -> str:
+    """Builds the class inheritance graph (as DOT source)."""
+    lines = [
+        '// Class Hierarchy',
+        'digraph {',
+        '\tdpi=250 rankdir=BT size="10,8"',
+        '\tnode [fillcolor=lightblue fontname=Arial shape=box style="rounded,filled"]'
+    ]
+    add = lines.append
     
     # Collect all classes
     all_classes = {}
@@ -257,102 +585,217 @@ def build_class_hierarchy(file_data: List[Dict], output_path: str):
         for cls in file_info.get("classes", []):
             all_classes[cls['name']] = cls
     
-    # Add nodes
+    # Add nodes (up to the configured cap)
+    limit = _max_graph_nodes()
+    truncated = len(all_classes) > limit
+    if truncated:
+        all_classes = dict(list(all_classes.items())[:limit])
     for cls_name in all_classes:
-        dot.node(cls_name, cls_name)
+        add(f'\t{_q(cls_name)} [label={_q(cls_name)}]')
     
     # Add inheritance edges
     for cls_name, cls_info in all_classes.items():
         for base in cls_info.get("bases", []):
             if base in all_classes:
-                dot.edge(cls_name, base, label="inherits", color="red")
+                add(f'\t{_q(cls_name)} -> {_q(base)} [label=inherits color=red]')
     
-    # Render
-    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
-    try:
-        dot.render(output_path, cleanup=True)
-        print(f"✅ Class hierarchy rendered: {output_path}.png")
-    except Exception as e:
-        print(f"❌ Failed to render graph: {e}")
+    return _finish_graph(lines, len(all_classes), truncated, "Class hierarchy")
+
+
+def render_graphs(graphs: List[Tuple[str, str, str]]):
+    """
+    Render (label, dot_source, output_path) entries to output_path + ".png".
+    Each graph gets its own `dot` process, started together so the layouts
+    (the expensive part on large repos) run in parallel on separate cores.
+    """
+    procs = []
+    for _, source, output_path in graphs:
+        try:
+            os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+            with open(output_path, "w", encoding="utf-8") as f:
+                f.write(source)
+            if os.path.exists(output_path + ".png"):
+                os.remove(output_path + ".png")  # So a stale image never reads as success
+            
+            # -O names the output after its input file plus the format suffix
+            procs.append(subprocess.Popen(["dot", "-Tpng", "-O", output_path],
+                                          stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True))
+        except OSError as e:
+            procs.append(e)
+    
+    for (label, _, output_path), proc in zip(graphs, procs):
+        if isinstance(proc, OSError):
+            error = str(proc)
+        else:
+            error = proc.communicate()[1].strip()
+        
+        if not isinstance(proc, OSError) and os.path.exists(output_path + ".png"):
+            print(f"✅ {label} rendered: {output_path}.png")
+        else:
+            print(f"❌ Failed to render graph: {error or output_path}")
+        try:
+            os.remove(output_path)  # Drop the DOT source
+        except OSError:
+            pass
+
+
+def build_dependency_tree(file_data: List[Dict], call_graph: Dict, output_path: str):
+    """Build and render the dependency tree to output_path + ".png"."""
+    render_graphs([("Dependency tree", _dependency_tree_graph(file_data, call_graph), output_path)])
+
+
+def build_class_hierarchy(file_data: List[Dict], output_path: str):
+    """Build and render the class hierarchy to output_path + ".png"."""
+    render_graphs([("Class hierarchy", _class_hierarchy_graph(file_data), output_path)])
 
 
 # ================================================================
 # MAIN ANALYSIS
 # ================================================================
 
+def _iter_source_files(repo_path: str):
+    """
+    Yield os.DirEntry objects for .py/.jac files under repo_path, in os.walk
+    (top-down) order. Uses os.scandir directly so directory checks come from
+    the cached dirent type, and never descends into SKIP_DIRS.
+    """
+    stack = [repo_path]
+    while stack:
+        directory = stack.pop()
+        subdirs = []
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in SKIP_DIRS:
+                            subdirs.append(entry.path)
+                    elif entry.name.endswith(_SRC_EXT):
+                        yield entry
+        except OSError:
+            continue  # Unreadable directory; os.walk skips these too
+        stack.extend(reversed(subdirs))
+
+
+# Bump when the shape of the analysis output (e.g. call-graph keys) changes
+ANALYSIS_CACHE_VERSION = 2
+
+
+def _sources_fingerprint(files: List[Tuple[str, str, os.stat_result]]) -> str:
+    """Digest of every (rel_path, mtime, size) walked; changes when any source file does."""
+    h = hashlib.blake2b(digest_size=16)
+    for _, rel_path, st in files:
+        h.update(f"{rel_path}\0{st.st_mtime_ns}\0{st.st_size}\n".encode('utf-8'))
+    return h.hexdigest()
+
+
 def run_analysis(repo_path: str, cache_path: str = "outputs/analyzer_output.json") -> Dict:
     """
     Main analysis entry point.
     """
     
-    # Check cache
+    # Stat every source file up front: the analysis cache is only valid
+    # while no file has been added, removed or modified since it was built
+    files = []
+    for dir_entry in _iter_source_files(repo_path):
+        try:
+            st = dir_entry.stat()
+        except OSError as e:
+            print(f"  ⚠️ Error reading {dir_entry.name}: {e}")
+            continue
+        
+        # Call-graph keys use the path within the repo, with / on every OS
+        rel_path = os.path.relpath(dir_entry.path, repo_path).replace(os.sep, '/')
+        files.append((dir_entry.path, rel_path, st))
+    fingerprint = _sources_fingerprint(files)
+    
+    # Check cache (only valid for the repository, format and files it was built with)
     if os.path.exists(cache_path):
-        print(f"♻️ Reusing cached analysis from {cache_path}")
-        with open(cache_path, "r") as f:
-            return json.load(f)
+        try:
+            with open(cache_path, "rb") as f:
+                cached = _loads_json(f.read())
+        except (OSError, ValueError):
+            cached = {}
+        if (cached.get("repo_path") == repo_path and cached.get("version") == ANALYSIS_CACHE_VERSION
+                and cached.get("sources") == fingerprint):
+            print(f"♻️ Reusing cached analysis from {cache_path}")
+            return cached
     
     print(f"🔍 Analyzing repository: {repo_path}")
     
-    parser = init_parser()
-    if not parser:
+    _init_worker_parser()
+    if not _WORKER_PARSER:
         return {"error": "Parser initialization failed"}
     
+    # Per-file parse cache lives next to the analysis cache
+    parse_cache_dir = os.path.join(os.path.dirname(cache_path) or ".", ".parse_cache")
+    graphs_dir = "outputs/graphs"
+    os.makedirs(parse_cache_dir, exist_ok=True)  # Also creates cache_path's directory
+    
+    # Reuse per-file cached results where possible
+    sources = []
+    results = []
+    for file_path, rel_path, st in files:
+        entry = _load_parse_cache(parse_cache_dir, file_path)
+        if entry and entry["entities"].get("path") != rel_path:
+            entry = None  # Cached under a different repo root
+        sources.append((file_path, rel_path, st, entry))
+        
+        # Unchanged since last run: no conversion or parsing needed
+        if entry and entry["mtime"] == st.st_mtime_ns and entry["size"] == st.st_size:
+            results.append((entry["entities"], entry["calls"]))
+        else:
+            results.append(None)
+    
+    # Hash and (if the content changed) parse the rest, in parallel when
+    # there are enough of them
+    pending = [i for i, cached in enumerate(results) if cached is None]
+    tasks = [(sources[i][0], sources[i][1], sources[i][3] and sources[i][3]["hash"]) for i in pending]
+    if any(task[0].endswith('.jac') for task in tasks):
+        _jac_executable()  # Resolve once here; forked workers inherit the result
+    if len(tasks) >= PARALLEL_MIN_FILES:
+        with ProcessPoolExecutor(max_workers=os.cpu_count(), initializer=_init_worker_parser) as pool:
+            outcomes = list(pool.map(_analyze_task, tasks, chunksize=PARALLEL_CHUNKSIZE))
+    else:
+        outcomes = [_analyze_task(task) for task in tasks]
+    
+    for i, (outcome, error) in zip(pending, outcomes):
+        file_path, _, st, entry = sources[i]
+        if error:
+            print(f"  ⚠️ Error parsing {os.path.basename(file_path)}: {error}")
+            continue
+        
+        digest, parsed = outcome
+        if parsed is None:
+            if not entry or entry["hash"] != digest:
+                continue  # Jac conversion failed
+            parsed = (entry["entities"], entry["calls"])  # Touched, not edited
+        results[i] = parsed
+        _save_parse_cache(parse_cache_dir, file_path, st, digest, *parsed)
+    
+    # Merge in walk order so output is deterministic
     file_data = []
     all_calls = {}
-    
-    # Parse files
-    for root, _, files in os.walk(repo_path):
-        if any(skip in root for skip in ['.git', '__pycache__', 'venv', 'node_modules']):
+    for (file_path, _, _, _), parsed in zip(sources, results):
+        if parsed is None:
             continue
+        entities, calls = parsed
+        if entities["functions"] or entities["classes"]:
+            file_data.append(entities)
+        all_calls.update(calls)
         
-        for filename in files:
-            if not (filename.endswith('.py') or filename.endswith('.jac')):
-                continue
-            
-            # Skip converted files to avoid duplicates
-            if '_converted.py' in filename:
-                continue
-            
-            file_path = os.path.join(root, filename)
-            original_path = file_path  # Store original path
-            
-            # Convert Jac if needed
-            if filename.endswith('.jac'):
-                converted = convert_jac_to_python(file_path)
-                if not converted:
-                    continue
-                file_path = converted # Use converted for parsing
-            
-            try:
-                with open(file_path, 'rb') as f:
-                    source_code = f.read()
-                
-                tree = parser.parse(source_code)
-                
-                # ✅ Pass both paths - parse converted, store original name
-                entities = extract_entities_minimal(tree, source_code, file_path, original_path)
-                if entities["functions"] or entities["classes"]:
-                    file_data.append(entities)
-                
-                # Extract call graph
-                calls = extract_call_relationships(tree, source_code)
-                all_calls.update(calls)
-                
-                func_count = len(entities["functions"])
-                class_count = len(entities["classes"])
-                print(f"  📄 {filename}: {class_count} classes, {func_count} functions")
-                
-            except Exception as e:
-                print(f"  ⚠️ Error parsing {filename}: {e}")
+        func_count = len(entities["functions"])
+        class_count = len(entities["classes"])
+        print(f"  📄 {os.path.basename(file_path)}: {class_count} classes, {func_count} functions")
     
     # Generate visualizations
     print("\n🎨 Generating dependency visualizations...")
     
-    dep_tree_path = "outputs/graphs/dependency_tree"
-    build_dependency_tree(file_data, all_calls, dep_tree_path)
-    
-    class_hier_path = "outputs/graphs/class_hierarchy"
-    build_class_hierarchy(file_data, class_hier_path)
+    dep_tree_path = f"{graphs_dir}/dependency_tree"
+    class_hier_path = f"{graphs_dir}/class_hierarchy"
+    render_graphs([
+        ("Dependency tree", _dependency_tree_graph(file_data, all_calls), dep_tree_path),
+        ("Class hierarchy", _class_hierarchy_graph(file_data), class_hier_path)
+    ])
     
     # Calculate statistics
     total_functions = sum(len(f["functions"]) for f in file_data)
@@ -361,9 +804,13 @@ def run_analysis(repo_path: str, cache_path: str = "outputs/analyzer_output.json
     
     # Build output
     result = {
+        "version": ANALYSIS_CACHE_VERSION,
         "repo_path": repo_path,
+        "sources": fingerprint,
         "files": file_data,
         "call_graph": all_calls,
+        "callers_index": invert_call_graph(all_calls),
+        "file_index": index_files(file_data),
         "graphs": {
             "dependency_tree": dep_tree_path + ".png",
             "class_hierarchy": class_hier_path + ".png"
@@ -377,9 +824,8 @@ def run_analysis(repo_path: str, cache_path: str = "outputs/analyzer_output.json
     }
     
     # Save cache
-    os.makedirs(os.path.dirname(cache_path) or ".", exist_ok=True)
-    with open(cache_path, "w", encoding="utf-8") as f:
-        json.dump(result, f, indent=2)
+    with open(cache_path, "wb") as f:
+        f.write(_dumps_json(result, indent=True))
     
     print(f"\n✅ Analysis complete!")
     print(f"   📊 {total_classes} classes, {total_functions} functions")
@@ -393,23 +839,70 @@ def run_analysis(repo_path: str, cache_path: str = "outputs/analyzer_output.json
 # QUERY HELPERS 
 # ================================================================
 
-def get_callers(function_name: str, call_graph: Dict) -> List[str]:
-    """Find all functions that call the given function."""
-    return [caller for caller, callees in call_graph.items() 
-            if function_name in callees]
+def invert_call_graph(call_graph: Dict) -> Dict[str, List[str]]:
+    """Map each callee to the functions that call it."""
+    callers_index = defaultdict(list)
+    for caller, callees in call_graph.items():
+        for callee in callees:
+            callers_index[callee].append(caller)
+    return dict(callers_index)
+
+
+def get_callers(function_name: str, call_graph: Dict, callers_index: Optional[Dict] = None) -> List[str]:
+    """
+    Find all functions that call the given function.
+    Pass the analysis result's "callers_index" to skip scanning the whole graph.
+    """
+    if callers_index is not None:
+        return callers_index.get(function_name, [])
+    return [caller for caller, callees in call_graph.items() if function_name in callees]
 
 
 def get_callees(function_name: str, call_graph: Dict) -> List[str]:
-    """Find all functions called by the given function."""
-    return call_graph.get(function_name, [])
+    """
+    Find all functions called by the given function. Accepts a qualified
+    name, or a bare name to merge every function defined with that name.
+    """
+    if function_name in call_graph:
+        return call_graph[function_name]
+    
+    suffix = f"::{function_name}"
+    callees = {}
+    for caller, targets in call_graph.items():
+        if caller.endswith(suffix):
+            callees.update(dict.fromkeys(targets))
+    return list(callees)
+
+
+def index_files(file_data: List[Dict]) -> Dict[str, Dict[str, int]]:
+    """Map each file's repo-relative path and its name to its position in file_data."""
+    file_index = {"path": {}, "file": {}}
+    for i, file_info in enumerate(file_data):
+        for key, positions in file_index.items():
+            if key in file_info:
+                positions.setdefault(file_info[key], i)  # First file wins, as in a scan
+    return file_index
 
 
-def get_file_entities(filename: str, file_data: List[Dict]) -> Dict:
-    """Get all entities from a specific file."""
+def get_file_entities(filename: str, file_data: List[Dict], file_index: Optional[Dict] = None) -> Dict:
+    """
+    Get all entities from a specific file.
+    Pass the analysis result's "file_index" to skip scanning every file.
+    """
+    if file_index is None:
+        file_index = index_files(file_data)
+    
+    # Exact path or name, then the basename of a path, then a partial-name match
+    basename = os.path.basename(filename)
+    for wanted in (filename, basename):
+        for key in ("path", "file"):
+            i = file_index.get(key, {}).get(wanted)
+            if i is not None:
+                return file_data[i]
     for file_info in file_data:
         if filename in file_info["file"]:
             return file_info
-    return {"functions": [], "classes": []}
+    return {"file": filename, "functions": [], "classes": []}
 
 
 
@@ -0,0 +1,253 @@
+"""
+Regression tests for analyzer_utils: parse cache, call-graph keys,
+directory pruning, file lookups, DOT quoting, graph rendering and the
+node cap.
+
+Run from BE/:  python -m unittest discover tests
+"""
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import analyzer_utils
+
+
+def _write(path, text):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+
+class AnalysisTestCase(unittest.TestCase):
+    """Runs each test in a scratch directory (run_analysis writes to outputs/)."""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.addCleanup(os.chdir, os.getcwd())
+        os.chdir(self._tmp.name)
+        self.repo = os.path.join(self._tmp.name, "repo")
+        self.cache_path = os.path.join("outputs", "analyzer_output.json")
+
+    def analyze(self, keep_result=False):
+        """
+        run_analysis, by default without the whole-repo cache so only the
+        per-file cache is exercised; returns (result, files parsed, reused).
+        """
+        if not keep_result and os.path.exists(self.cache_path):
+            os.remove(self.cache_path)
+        out = io.StringIO()
+        with mock.patch.object(analyzer_utils, "_analyze_source",
+                               wraps=analyzer_utils._analyze_source) as parse, \
+                contextlib.redirect_stdout(out):
+            result = analyzer_utils.run_analysis(self.repo, self.cache_path)
+        return result, parse.call_count, "Reusing cached analysis" in out.getvalue()
+
+
+class ParseCacheTests(AnalysisTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.source = os.path.join(self.repo, "app.py")
+        _write(self.source, "def main():\n    helper()\n\ndef helper():\n    pass\n")
+        _write(os.path.join(self.repo, "lib.py"), "class Store:\n    def get(self):\n        pass\n")
+        self.first, parsed, _ = self.analyze()
+        self.assertEqual(parsed, 2)
+
+    def test_unchanged_files_are_not_reparsed(self):
+        result, parsed, _ = self.analyze()
+        self.assertEqual(parsed, 0)
+        self.assertEqual(result["files"], self.first["files"])
+        self.assertEqual(result["call_graph"], self.first["call_graph"])
+
+    def test_touched_but_unchanged_file_falls_back_to_hash(self):
+        st = os.stat(self.source)
+        os.utime(self.source, ns=(st.st_atime_ns, st.st_mtime_ns + 5_000_000_000))
+        result, parsed, _ = self.analyze()
+        self.assertEqual(parsed, 0)
+        self.assertEqual(result["call_graph"], self.first["call_graph"])
+
+    def test_edited_file_is_reparsed(self):
+        _write(self.source, "def main():\n    pass\n\ndef added():\n    main()\n")
+        result, parsed, _ = self.analyze()
+        self.assertEqual(parsed, 1)
+        app = next(f for f in result["files"] if f["path"] == "app.py")
+        self.assertEqual([func["name"] for func in app["functions"]], ["main", "added"])
+        self.assertEqual(result["call_graph"]["app.py::::added"], ["main"])
+
+    def test_version_bump_invalidates_entries(self):
+        with mock.patch.object(analyzer_utils, "PARSE_CACHE_VERSION",
+                               analyzer_utils.PARSE_CACHE_VERSION + 1):
+            _, parsed, _ = self.analyze()
+        self.assertEqual(parsed, 2)
+
+
+class AnalysisCacheTests(AnalysisTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.source = os.path.join(self.repo, "app.py")
+        _write(self.source, "def main():\n    pass\n")
+        self.analyze()
+
+    def test_unchanged_repo_reuses_result(self):
+        _, parsed, reused = self.analyze(keep_result=True)
+        self.assertEqual((parsed, reused), (0, True))
+
+    def test_edited_file_invalidates_result(self):
+        _write(self.source, "def main():\n    added()\n\ndef added():\n    pass\n")
+        result, parsed, reused = self.analyze(keep_result=True)
+        self.assertEqual((parsed, reused), (1, False))
+        self.assertEqual(result["call_graph"]["app.py::::main"], ["added"])
+
+    def test_added_and_removed_files_invalidate_result(self):
+        _write(os.path.join(self.repo, "lib.py"), "def helper():\n    pass\n")
+        result, parsed, reused = self.analyze(keep_result=True)
+        self.assertEqual((parsed, reused), (1, False))
+        self.assertIn("lib.py::::helper", result["call_graph"])
+
+        os.remove(self.source)
+        result, parsed, reused = self.analyze(keep_result=True)
+        self.assertEqual((parsed, reused), (0, False))
+        self.assertNotIn("app.py::::main", result["call_graph"])
+
+    def test_result_from_older_format_is_not_reused(self):
+        _write(os.path.join(self.repo, "app.py"), "def main():\n    pass\n")
+        _write(self.cache_path, '{"repo_path": "%s", "files": [], "call_graph": {"main": []}}' % self.repo)
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = analyzer_utils.run_analysis(self.repo, self.cache_path)
+        self.assertEqual(result["version"], analyzer_utils.ANALYSIS_CACHE_VERSION)
+        self.assertIn("app.py::::main", result["call_graph"])
+
+
+class CallGraphKeyTests(AnalysisTestCase):
+
+    def test_same_named_files_get_separate_keys(self):
+        _write(os.path.join(self.repo, "a", "util.py"), "def f():\n    g()\n")
+        _write(os.path.join(self.repo, "b", "util.py"), "def f():\n    h()\n")
+        _write(os.path.join(self.repo, "b", "model.py"),
+               "class Model:\n    def save(self):\n        f()\n")
+        result, _, _ = self.analyze()
+        self.assertEqual(result["call_graph"], {
+            "a/util.py::::f": ["g"],
+            "b/util.py::::f": ["h"],
+            "b/model.py::Model::save": ["f"],
+        })
+        self.assertEqual(analyzer_utils.qualified_name("a/util.py", None, "f"), "a/util.py::::f")
+
+
+class JacResolutionTests(AnalysisTestCase):
+
+    def analyze_with_jac(self, jac_path):
+        with mock.patch.object(analyzer_utils, "_jac_executable", return_value=jac_path) as resolve:
+            self.analyze()
+        return resolve.called
+
+    def test_python_only_repo_never_looks_for_jac(self):
+        _write(os.path.join(self.repo, "app.py"), "def main():\n    pass\n")
+        self.assertFalse(self.analyze_with_jac(None))
+
+    def test_jac_files_resolve_the_cli(self):
+        _write(os.path.join(self.repo, "main.jac"), "with entry {}\n")
+        self.assertTrue(self.analyze_with_jac(None))
+
+
+class IterSourceFilesTests(AnalysisTestCase):
+
+    def test_skip_dirs_are_pruned(self):
+        for rel in ("main.py", "pkg/mod.jac", "pkg/sub/deep.py", "venv/lib.py",
+                    "node_modules/x/y.py", ".git/hook.py", "pkg/__pycache__/mod.py", "outputs/gen.py"):
+            _write(os.path.join(self.repo, rel), "")
+        _write(os.path.join(self.repo, "notes.txt"), "")
+        found = sorted(os.path.relpath(entry.path, self.repo).replace(os.sep, "/")
+                       for entry in analyzer_utils._iter_source_files(self.repo))
+        self.assertEqual(found, ["main.py", "pkg/mod.jac", "pkg/sub/deep.py"])
+
+
+class DotQuotingTests(unittest.TestCase):
+
+    def test_backslashes_and_quotes_are_escaped(self):
+        self.assertEqual(analyzer_utils._q('plain'), '"plain"')
+        self.assertEqual(analyzer_utils._q('say "hi"'), '"say \\"hi\\""')
+        self.assertEqual(analyzer_utils._q('C:\\dir\\'), '"C:\\\\dir\\\\"')
+        self.assertEqual(analyzer_utils._q('\\"'), '"\\\\\\""')
+
+
+class RenderGraphsTests(AnalysisTestCase):
+
+    def render(self, output_path):
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            analyzer_utils.build_class_hierarchy([], output_path)
+        return out.getvalue()
+
+    def test_output_directory_is_recreated(self):
+        self.render("outputs/graphs/h")
+        os.rename("outputs", "old_outputs")  # Deleted between runs
+        self.render("outputs/graphs/h")
+        self.assertTrue(os.path.isdir("outputs/graphs"))
+        self.assertFalse(os.path.exists("outputs/graphs/h"))  # DOT source dropped
+
+    def test_unwritable_output_is_reported(self):
+        _write(os.path.join(self._tmp.name, "blocker"), "")
+        self.assertIn("❌", self.render("blocker/h"))
+
+
+class FileEntitiesTests(unittest.TestCase):
+    FILE_DATA = [
+        {"file": "util.py", "path": "a/util.py", "functions": [{"name": "f"}], "classes": []},
+        {"file": "util.py", "path": "b/util.py", "functions": [{"name": "g"}], "classes": []},
+        {"file": "models.py", "path": "b/models.py", "functions": [], "classes": [{"name": "M"}]},
+    ]
+
+    def lookup(self, filename):
+        """Result with the stored index, checked against the unindexed lookup."""
+        file_index = analyzer_utils.index_files(self.FILE_DATA)
+        found = analyzer_utils.get_file_entities(filename, self.FILE_DATA, file_index)
+        self.assertEqual(found, analyzer_utils.get_file_entities(filename, self.FILE_DATA))
+        return found
+
+    def test_path_then_name_then_partial_match(self):
+        self.assertIs(self.lookup("b/util.py"), self.FILE_DATA[1])
+        self.assertIs(self.lookup("util.py"), self.FILE_DATA[0])
+        self.assertIs(self.lookup("/abs/repo/b/models.py"), self.FILE_DATA[2])
+        self.assertIs(self.lookup("models"), self.FILE_DATA[2])
+
+    def test_missing_file(self):
+        self.assertEqual(self.lookup("nope.py"), {"file": "nope.py", "functions": [], "classes": []})
+
+
+class NodeCapTests(unittest.TestCase):
+    FILE_DATA = [{
+        "file": "app.py",
+        "path": "app.py",
+        "functions": [{"name": name, "parent": None} for name in ("a", "b", "c")],
+        "classes": []
+    }]
+
+    def graph(self, limit):
+        out = io.StringIO()
+        with mock.patch.dict(os.environ, {"CODEGENIUS_MAX_GRAPH_NODES": limit}), \
+                contextlib.redirect_stdout(out):
+            source = analyzer_utils._dependency_tree_graph(self.FILE_DATA, {})
+        return source.count("fillcolor="), "truncated" in out.getvalue()
+
+    def test_no_cap_by_default(self):
+        self.assertEqual(self.graph("0"), (3, False))
+        self.assertEqual(self.graph("not a number"), (3, False))
+
+    def test_cap_equal_to_node_count_is_not_truncation(self):
+        self.assertEqual(self.graph("3"), (3, False))
+
+    def test_cap_below_node_count_truncates(self):
+        self.assertEqual(self.graph("2"), (2, True))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -5,10 +5,18 @@ import time
 import json
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:  # optional: fall back to stdlib json
+    orjson = None
+
 # Configuration
 OUTPUTS_DIR = Path("outputs")
 GRAPHS_DIR = OUTPUTS_DIR / "graphs"
 JAC_MAIN = "main.jac"
+POLL_INTERVAL = 2  # seconds between progress checks
+MAX_POLL_ATTEMPTS = 30
+FILE_BYTES_PREFIX = "filebytes:"  # session_state keys holding output file contents
 
 # Page config
 st.set_page_config(
@@ -24,25 +32,32 @@ if 'repo_url' not in st.session_state:
     st.session_state.repo_url = ""
 if 'completed' not in st.session_state:
     st.session_state.completed = False
+if 'pipeline_done' not in st.session_state:
+    st.session_state.pipeline_done = False
+if 'poll_attempts' not in st.session_state:
+    st.session_state.poll_attempts = 0
+if 'poll_timed_out' not in st.session_state:
+    st.session_state.poll_timed_out = False
 
+@st.cache_data
 def get_repo_name(url):
     """Extract repository name from GitHub URL."""
     return url.rstrip('/').split('/')[-1].replace('.git', '')
 
 def check_outputs_exist(repo_name):
-    """Check if analysis outputs exist for the given repo."""
-    mapper_file = OUTPUTS_DIR / "repo_mapper_output.json"
-    analyzer_file = OUTPUTS_DIR / "analyzer_output.json"
-    docs_file = OUTPUTS_DIR / f"{repo_name}_docs.md"
-    graph_file = GRAPHS_DIR / "code_graph.png"
-    
-    return {
-        'mapper': mapper_file.exists(),
-        'analyzer': analyzer_file.exists(),
-        'docs': docs_file.exists(),
-        'graph': graph_file.exists(),
-        'all_ready': all([mapper_file.exists(), docs_file.exists()])
+    """Check if analysis outputs exist for the given repo.
+
+    Deliberately uncached: it is the poll target, and four stat calls per
+    tick are cheaper than serving a stale answer.
+    """
+    outputs = {
+        'mapper': (OUTPUTS_DIR / "repo_mapper_output.json").exists(),
+        'analyzer': (OUTPUTS_DIR / "analyzer_output.json").exists(),
+        'docs': (OUTPUTS_DIR / f"{repo_name}_docs.md").exists(),
+        'graph': (GRAPHS_DIR / "code_graph.png").exists()
     }
+    outputs['all_ready'] = outputs['mapper'] and outputs['docs']
+    return outputs
 
 def run_jac_pipeline(repo_url):
     """Trigger the Jac pipeline as a subprocess."""
@@ -59,21 +74,82 @@ def run_jac_pipeline(repo_url):
     except Exception as e:
         return False, "", str(e)
 
+def cached_file_bytes(path):
+    """
+    File contents, kept in session state until the file's mtime changes so
+    reruns don't reopen it. Returns None if the file does not exist.
+    """
+    try:
+        mtime = path.stat().st_mtime_ns
+    except OSError:
+        return None
+    key = f"{FILE_BYTES_PREFIX}{path}:{mtime}"
+    if key not in st.session_state:
+        clear_file_bytes(path)  # Drop older versions of this file
+        st.session_state[key] = path.read_bytes()
+    return st.session_state[key]
+
+def clear_file_bytes(path=None):
+    """Forget cached contents for one file, or for every file when path is None."""
+    prefix = FILE_BYTES_PREFIX if path is None else f"{FILE_BYTES_PREFIX}{path}:"
+    for key in [k for k in st.session_state.keys() if k.startswith(prefix)]:
+        del st.session_state[key]
+
 def load_markdown_doc(repo_name):
     """Load the generated Markdown documentation."""
-    docs_file = OUTPUTS_DIR / f"{repo_name}_docs.md"
-    if docs_file.exists():
-        return docs_file.read_text(encoding='utf-8')
+    data = cached_file_bytes(OUTPUTS_DIR / f"{repo_name}_docs.md")
+    if data is not None:
+        return data.decode('utf-8')
     return None
 
 def load_json_output(file_name):
     """Load JSON output files."""
     json_file = OUTPUTS_DIR / file_name
     if json_file.exists():
-        with open(json_file, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        data = json_file.read_bytes()
+        return orjson.loads(data) if orjson is not None else json.loads(data)
     return None
 
+def render_status_row(outputs=None):
+    """Draw the four pipeline-stage badges (all pending when outputs is None)."""
+    col1, col2, col3, col4 = st.columns(4)
+    if outputs is None:
+        col1.info("⏳ Cloning...")
+        outputs = {}
+    else:
+        col1.success("✅ Cloned")
+    if outputs.get('mapper'):
+        col2.success("✅ Mapped")
+    else:
+        col2.warning("⏸️ Mapping")
+    if outputs.get('analyzer'):
+        col3.success("✅ Analyzed")
+    else:
+        col3.warning("⏸️ Analyzing")
+    if outputs.get('docs'):
+        col4.success("✅ Generated")
+    else:
+        col4.warning("⏸️ Docs")
+
+@st.fragment(run_every=POLL_INTERVAL)
+def progress_fragment(repo_name):
+    """Poll for the pipeline's outputs; only this fragment reruns on each tick."""
+    outputs = check_outputs_exist(repo_name)
+    render_status_row(outputs)
+
+    if outputs['all_ready']:
+        st.session_state.completed = True
+        st.session_state.processing = False
+        st.success("🎉 Analysis complete!")
+        time.sleep(1)
+        st.rerun()
+
+    st.session_state.poll_attempts += 1
+    if st.session_state.poll_attempts >= MAX_POLL_ATTEMPTS:
+        st.session_state.processing = False
+        st.session_state.poll_timed_out = True
+        st.rerun()  # A full-app rerun drops the fragment and stops its timer
+
 # Header
 st.title("🧩 Codebase Genius")
 st.markdown("**Automatic Documentation Generator** — Turn any GitHub repository into structured docs.")
@@ -101,6 +177,9 @@ if analyze_button and repo_url:
     st.session_state.processing = True
     st.session_state.repo_url = repo_url
     st.session_state.completed = False
+    st.session_state.pipeline_done = False
+    st.session_state.poll_timed_out = False
+    clear_file_bytes()  # A new analysis rewrites every output
     st.rerun()
 
 if st.session_state.processing:
@@ -108,52 +187,28 @@ if st.session_state.processing:
     st.markdown("---")
     st.markdown("### 🔄 Processing Pipeline")
 
-    progress_container = st.container()
-    status_placeholder = st.empty()
-
-    with progress_container:
-        col1, col2, col3, col4 = st.columns(4)
-        status_icons = {
-            'cloning': col1.empty(),
-            'mapping': col2.empty(),
-            'analyzing': col3.empty(),
-            'generating': col4.empty()
-        }
-        status_icons['cloning'].info("⏳ Cloning...")
-        status_icons['mapping'].warning("⏸️ Mapping")
-        status_icons['analyzing'].warning("⏸️ Analyzing")
-        status_icons['generating'].warning("⏸️ Docs")
-
-    with status_placeholder.container():
+    if not st.session_state.pipeline_done:
+        status_row = st.empty()
+        with status_row.container():
+            render_status_row()
+
         with st.spinner("🚀 Running Codebase Genius pipeline..."):
             success, stdout, stderr = run_jac_pipeline(st.session_state.repo_url)
+        status_row.empty()
 
-    if success:
-        max_attempts = 30
-        for _ in range(max_attempts):
-            outputs = check_outputs_exist(repo_name)
-            status_icons['cloning'].success("✅ Cloned")
-            if outputs['mapper']:
-                status_icons['mapping'].success("✅ Mapped")
-            if outputs['analyzer']:
-                status_icons['analyzing'].success("✅ Analyzed")
-            if outputs['docs']:
-                status_icons['generating'].success("✅ Generated")
-            if outputs['all_ready']:
-                st.session_state.completed = True
-                st.session_state.processing = False
-                st.success("🎉 Analysis complete!")
-                time.sleep(1)
-                st.rerun()
-                break
-            time.sleep(2)
+        if success:
+            st.session_state.pipeline_done = True
+            st.session_state.poll_attempts = 0
         else:
-            st.error("⚠️ Timeout waiting for outputs. Check the outputs/ directory manually.")
+            st.error("❌ Pipeline failed. Check logs below:")
+            st.code(stderr if stderr else stdout, language="text")
             st.session_state.processing = False
-    else:
-        st.error("❌ Pipeline failed. Check logs below:")
-        st.code(stderr if stderr else stdout, language="text")
-        st.session_state.processing = False
+
+    if st.session_state.pipeline_done:
+        progress_fragment(repo_name)
+
+if st.session_state.poll_timed_out:
+    st.error("⚠️ Timeout waiting for outputs. Check the outputs/ directory manually.")
 
 # Display results
 if st.session_state.completed and st.session_state.repo_url:
@@ -165,15 +220,15 @@ if st.session_state.completed and st.session_state.repo_url:
     col1, col2 = st.columns(2)
     docs_file = OUTPUTS_DIR / f"{repo_name}_docs.md"
     graph_file = GRAPHS_DIR / "code_graph.png"
+    docs_bytes = cached_file_bytes(docs_file)
+    graph_bytes = cached_file_bytes(graph_file)
 
     with col1:
-        if docs_file.exists():
-            with open(docs_file, 'rb') as f:
-                st.download_button("📄 Download Docs (.md)", f, file_name=docs_file.name, mime="text/markdown")
+        if docs_bytes is not None:
+            st.download_button("📄 Download Docs (.md)", docs_bytes, file_name=docs_file.name, mime="text/markdown")
     with col2:
-        if graph_file.exists():
-            with open(graph_file, 'rb') as f:
-                st.download_button("🖼️ Download Graph (.png)", f, file_name=graph_file.name, mime="image/png")
+        if graph_bytes is not None:
+            st.download_button("🖼️ Download Graph (.png)", graph_bytes, file_name=graph_file.name, mime="image/png")
 
     # Tabs
     tab1, tab2, tab3, tab4 = st.tabs(["📝 Documentation", "🗺️ Repo Map", "🔍 Analysis", "📈 Graph"])
@@ -204,8 +259,8 @@ if st.session_state.completed and st.session_state.repo_url:
 
     with tab4:
         st.subheader("Code Structure Graph")
-        if graph_file.exists():
-            st.image(str(graph_file), use_container_width=True)
+        if graph_bytes is not None:
+            st.image(graph_bytes, use_container_width=True)
         else:
             st.warning("Graph not found.")
 
@@ -214,6 +269,7 @@ if st.session_state.completed and st.session_state.repo_url:
         st.session_state.processing = False
         st.session_state.completed = False
         st.session_state.repo_url = ""
+        clear_file_bytes()
         st.rerun()
 
 # Footer